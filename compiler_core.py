@@ -0,0 +1,581 @@
+import functools
+from array import array
+from collections.abc import Callable
+
+# ========================
+# 1. Compiler Logic (Lexer & Parser)
+# ========================
+
+# Print per-token trace output to the console. Errors are always printed.
+DEBUG = False
+
+class T:
+    """Integer token type codes shared by the lexer, parser and evaluator."""
+    INT_KEYWORD = 0
+    RETURN_KEYWORD = 1
+    IDENTIFIER = 2
+    STRING_LITERAL = 3
+    NUMBER = 4
+    PLUS = 5
+    MINUS = 6
+    EQUALS = 7
+    LPAREN = 8
+    RPAREN = 9
+    LBRACE = 10
+    RBRACE = 11
+    SEMICOLON = 12
+    COMMA = 13
+
+
+# Token type code -> name, for display and error messages
+TOKEN_NAMES = {code: name for name, code in vars(T).items() if not name.startswith('_')}
+
+# Single-character tokens, mapped straight to their token type
+PUNCTUATION = {
+    '+': T.PLUS,
+    '-': T.MINUS,
+    '=': T.EQUALS,
+    '(': T.LPAREN,
+    ')': T.RPAREN,
+    '{': T.LBRACE,
+    '}': T.RBRACE,
+    ';': T.SEMICOLON,
+    ',': T.COMMA,
+}
+
+# Identifiers that are keywords instead
+KEYWORDS = {
+    'int': T.INT_KEYWORD,
+    'return': T.RETURN_KEYWORD,
+}
+
+# Keyword token type -> its text, so every keyword token shares one string
+_KEYWORD_TEXT = {kind: word for word, kind in KEYWORDS.items()}
+
+# Start-state table for the scanner: the first character of a token decides
+# what it is. Punctuation maps straight to its (non-negative) token type so it
+# is emitted with this one lookup; every other class is a negative code.
+# Letters and digits sort lowest so "is a word character" is `<= _DIGIT`.
+_LETTER, _DIGIT, _SPACE, _QUOTE, _OTHER = -5, -4, -3, -2, -1
+
+# Byte -> action for the source encoded as Latin-1. Characters outside
+# Latin-1 encode as '?', which is _OTHER, so they fall through to the slow
+# path that inspects the real character.
+CHAR_CLASS = [_OTHER] * 256
+for _code in range(256):
+    _ch = chr(_code)
+    if _ch.isspace():
+        CHAR_CLASS[_code] = _SPACE
+    elif _ch.isascii() and (_ch.isalpha() or _ch == '_'):
+        CHAR_CLASS[_code] = _LETTER
+    elif _ch.isascii() and _ch.isdigit():
+        CHAR_CLASS[_code] = _DIGIT
+    elif _ch in PUNCTUATION:
+        CHAR_CLASS[_code] = PUNCTUATION[_ch]
+    elif _ch == '"':
+        CHAR_CLASS[_code] = _QUOTE
+del _code, _ch
+
+
+def _is_word_char(ch: str) -> bool:
+    """Unicode-aware word character test, used only off the ASCII fast path."""
+    return ch.isalnum() or ch == '_'
+
+
+def lexical_analyzer(code: str) -> tuple[array, list[str], bool]:
+    """FUNCTION 1: Lexical Analyzer (Lexer). Breaks code into tokens.
+
+    One left-to-right pass over the source with no backtracking, so lexing
+    time is linear in the input size.
+    """
+    if DEBUG:
+        print("--- Running Lexical Analyzer ---")
+    # Tokens are stored as parallel arrays: packed type codes and values.
+    # String literals are stored without their quotes. Numbers keep their
+    # source text: int() refuses very long literals, which still lex fine.
+    types = array('i')
+    values = []
+    types_append = types.append
+    values_append = values.append
+    # Globals used per character are bound to locals
+    char_class = CHAR_CLASS
+    keyword_type = KEYWORDS.get
+    keyword_text = _KEYWORD_TEXT
+    IDENTIFIER = T.IDENTIFIER
+    NUMBER = T.NUMBER
+    has_error = False
+    # Classify by byte: one bytes index and one list index per position
+    buf = code.encode('latin-1', 'replace')
+    pos = 0
+    n = len(code)
+    
+    while pos < n:
+        cls = char_class[buf[pos]]
+        
+        if cls == _SPACE:
+            pos += 1
+            continue
+        
+        ch = code[pos]
+        if cls >= 0:
+            types_append(cls)
+            values_append(ch)
+            pos += 1
+            continue
+        
+        end = pos + 1
+        if cls <= _DIGIT:
+            # Identifier, keyword or number: scan the ASCII word run
+            while end < n and char_class[buf[end]] <= _DIGIT:
+                end += 1
+            word = code[pos:end]
+            
+            if end == n or not _is_word_char(code[end]):
+                if cls == _LETTER:
+                    kind = keyword_type(word)
+                    if kind is None:
+                        types_append(IDENTIFIER)
+                        values_append(word)
+                    else:
+                        # Store the shared keyword string, not this copy
+                        types_append(kind)
+                        values_append(keyword_text[kind])
+                    pos = end
+                    continue
+                if word.isdigit():
+                    types_append(NUMBER)
+                    values_append(word)
+                    pos = end
+                    continue
+        
+        elif cls == _QUOTE:
+            # String literal runs to the next quote; unterminated is an error.
+            # The value is stored without its quotes.
+            close = code.find('"', end)
+            if close != -1:
+                types_append(T.STRING_LITERAL)
+                values_append(code[end:close])
+                pos = close + 1
+                continue
+        
+        elif ch.isspace():
+            pos += 1
+            continue
+        
+        # Off the fast path, take the whole Unicode word run: all decimal
+        # digits is a number, anything else (like 5abc) is unknown.
+        if _is_word_char(ch):
+            end = pos + 1
+            while end < n and _is_word_char(code[end]):
+                end += 1
+            word = code[pos:end]
+            if word.isdecimal():
+                types_append(T.NUMBER)
+                values_append(word)
+                pos = end
+                continue
+        else:
+            end = pos + 1
+        
+        # Extend the gap over any further characters that cannot start a
+        # token and report it once, not once per character.
+        while end < n:
+            nxt = code[end]
+            if char_class[buf[end]] != _OTHER or _is_word_char(nxt) or nxt.isspace():
+                break
+            end += 1
+        gap = code[pos:end]
+        print(f"Lexical Error: Unknown character{'s' if len(gap) > 1 else ''} '{gap}'")
+        has_error = True
+        pos = end
+    
+    if DEBUG:
+        print(f"Found {len(types)} tokens.")
+    return types, values, has_error
+
+
+# The parser works on a sequence of token types terminated by EOF. Each parse
+# function takes that sequence and the current index and returns the index after
+# what it consumed, so all parser state lives in local variables.
+EOF = -1
+
+
+def _expect(types: list, i: int, expected_type: int) -> int:
+    """Consumes the token at i if it matches, else raises SyntaxError."""
+    current_type = types[i]
+    if current_type != expected_type:
+        raise SyntaxError(
+            f"Expected token type '{TOKEN_NAMES[expected_type]}' "
+            f"but got '{TOKEN_NAMES.get(current_type)}'"
+        )
+    if DEBUG:
+        print(f"  Syntax: Matched '{TOKEN_NAMES[expected_type]}'")
+    return i + 1
+
+
+def _parse_declaration(types: list, i: int) -> int:
+    """Variable Declaration (int x = 5;)."""
+    i = _expect(types, i + 1, T.IDENTIFIER) # consume 'int' and the variable name
+    
+    # Check for initialization (= 5)
+    if types[i] == T.EQUALS:
+        i = _parse_expression(types, i + 1) # consume '=' and parse value
+    
+    i = _expect(types, i, T.SEMICOLON)
+    if DEBUG:
+        print("  Syntax: Parsed variable declaration")
+    return i
+
+
+def _parse_return(types: list, i: int) -> int:
+    """Return Statement (return 5;)."""
+    i += 1
+    # Parse expression unless it's immediately a semicolon
+    if types[i] != T.SEMICOLON:
+        i = _parse_expression(types, i)
+    i = _expect(types, i, T.SEMICOLON)
+    if DEBUG:
+        print("  Syntax: Parsed return statement")
+    return i
+
+
+def _parse_call(types: list, i: int) -> int:
+    """Function Call: name(...); with i at the '('."""
+    i = _parse_arguments(types, i + 1) # consume '('
+    i = _expect(types, i, T.RPAREN)
+    i = _expect(types, i, T.SEMICOLON)
+    if DEBUG:
+        print("  Syntax: Parsed function call")
+    return i
+
+
+def _parse_assignment(types: list, i: int) -> int:
+    """Assignment: name = ...; with i at the '='."""
+    i = _parse_expression(types, i + 1) # consume '='
+    i = _expect(types, i, T.SEMICOLON)
+    if DEBUG:
+        print("  Syntax: Parsed assignment")
+    return i
+
+
+# Token after an identifier -> statement it starts
+_IDENTIFIER_DISPATCH = {
+    T.LPAREN: _parse_call,
+    T.EQUALS: _parse_assignment,
+}
+
+
+def _parse_identifier_statement(types: list, i: int) -> int:
+    """Identifier Start (Assignment OR Function Call)."""
+    i += 1 # consume the identifier name
+    handler = _IDENTIFIER_DISPATCH.get(types[i])
+    if handler is None:
+        raise SyntaxError(f"Expected '(' or '=' after identifier, got '{TOKEN_NAMES.get(types[i])}'")
+    return handler(types, i)
+
+
+# First token of a statement -> parse function
+_STMT_DISPATCH = {
+    T.INT_KEYWORD: _parse_declaration,
+    T.RETURN_KEYWORD: _parse_return,
+    T.IDENTIFIER: _parse_identifier_statement,
+}
+
+
+def _parse_statement(types: list, i: int) -> int:
+    """Parse a statement (Variables, Return, Calls, Assignments)."""
+    handler = _STMT_DISPATCH.get(types[i])
+    if handler is None:
+        raise SyntaxError(f"Unexpected statement starting with '{TOKEN_NAMES.get(types[i])}'")
+    return handler(types, i)
+
+
+def _parse_arguments(types: list, i: int) -> int:
+    """Parse function arguments."""
+    if types[i] == T.RPAREN:
+        return i
+    
+    # Bind the loop's lookups to locals once
+    parse_expression = _parse_expression
+    comma = T.COMMA
+    i = parse_expression(types, i)
+    while types[i] == comma:
+        i = _expect(types, i, comma)
+        i = parse_expression(types, i)
+    return i
+
+
+# Token types that can start (and make up) a term
+_EXPR_FIRST_SET = frozenset({T.NUMBER, T.IDENTIFIER, T.STRING_LITERAL})
+
+
+def _parse_expression(types: list, i: int) -> int:
+    """Parse expressions with Math support (left-to-right).
+
+    Terms (Number, String, or Variable) are matched inline in the operator
+    loop rather than through a call per term.
+    """
+    first_set = _EXPR_FIRST_SET
+    plus, minus = T.PLUS, T.MINUS
+    while True:
+        # Parse a term
+        current = types[i]
+        if current not in first_set:
+            raise SyntaxError(f"Expected number or identifier, got '{TOKEN_NAMES.get(current)}'")
+        if DEBUG:
+            print(f"  Syntax: Matched '{TOKEN_NAMES[current]}'")
+        i += 1
+
+        # Check for operators (+ or -)
+        op = types[i]
+        if op != plus and op != minus:
+            return i
+        if DEBUG:
+            print(f"  Syntax: Found operator '{TOKEN_NAMES[types[i]]}'")
+        i += 1 # consume operator
+
+
+# Token types that end the statement list of a block
+_STMT_TERMINATORS = frozenset({T.RBRACE, EOF})
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_program(key: bytes) -> str | None:
+    """Parses a program given the raw bytes of its type array. Returns None on
+    success, else the syntax error message. Cached so rerunning unchanged code
+    is free; syntax_analyzer skips the cache when DEBUG is on."""
+    packed = array('i')
+    packed.frombytes(key)
+    # Unpack into a list once: list indexing is cheaper than array indexing
+    types = packed.tolist()
+    types.append(EOF)
+    try:
+        # Expect: int main() { statements }
+        i = _expect(types, 0, T.INT_KEYWORD)
+        i = _expect(types, i, T.IDENTIFIER)  # main
+        i = _expect(types, i, T.LPAREN)
+        i = _expect(types, i, T.RPAREN)
+        i = _expect(types, i, T.LBRACE)
+        
+        # Parse statements until closing brace
+        parse_statement = _parse_statement
+        terminators = _STMT_TERMINATORS
+        while types[i] not in terminators:
+            i = parse_statement(types, i)
+        
+        i = _expect(types, i, T.RBRACE)
+        
+        if types[i] != EOF:
+            raise SyntaxError("Unexpected tokens at end of file.")
+    
+    except SyntaxError as e:
+        return str(e)
+    return None
+
+
+def syntax_analyzer(types: array) -> bool:
+    """FUNCTION 2: Syntax Analyzer (Parser). Only needs the token types."""
+    if DEBUG:
+        print("\n--- Running Syntax Analyzer ---")
+    # The parse trace is printed while parsing, so a cached result would
+    # hide it; with DEBUG on, every run parses afresh
+    parse = _parse_program.__wrapped__ if DEBUG else _parse_program
+    error = parse(types.tobytes())
+    
+    if error is not None:
+        print(f"Syntax Analysis Failed: {error}")
+        return False
+    
+    if DEBUG:
+        print("Syntax Analysis Successful!")
+    return True
+
+def _walk_program(types: list, values: list[str]):
+    """Walks the tokens the way the evaluator always has, yielding each
+    statement as soon as it is found so the caller can run it before the
+    walk goes on. Where the token stream runs out mid-statement the walk
+    raises IndexError, at the same point the evaluator always did.
+
+    Each statement is (target, start, stop): target is the variable assigned,
+    or None for printf. The expression's operands are the tokens at
+    range(start, stop, 2), with the operator before each one after the
+    first. start is None for a declaration, which sets the variable to 0.
+    Operands are not checked here; evaluating a bad one raises."""
+    n = len(types)
+    plus, minus = T.PLUS, T.MINUS
+    i = 0
+    while i < n:
+        ttype = types[i]
+        
+        # int x;  (also 'int x = expr;', which leaves x at 0)
+        if ttype == T.INT_KEYWORD:
+            yield values[i+1], None, None
+            i += 3
+            continue
+        
+        if ttype == T.IDENTIFIER:
+            # x = expr;  or  printf(expr);
+            if types[i+1] == T.EQUALS:
+                target = values[i]
+            elif values[i] == "printf":
+                target = None
+            else:
+                i += 1
+                continue
+            
+            # The expression runs while operators follow its operands
+            start = stop = i + 2
+            stop += 1
+            while stop < n and (types[stop] == plus or types[stop] == minus):
+                stop += 2
+            yield target, start, stop
+            
+            if target is None:
+                # skip until semicolon
+                while types[i] != T.SEMICOLON:
+                    i += 1
+                i += 1
+            else:
+                i += 4
+            continue
+        
+        i += 1
+
+
+# Compiling a program costs about as much as interpreting it seven times, so
+# a program is only compiled once it has been interpreted about that often.
+# The run that compiles is a one-off spike; for a 9k-statement program it
+# takes ~100 ms against ~14 ms interpreted, and later runs take ~1.5 ms.
+#
+# Runs are counted by the type bytes alone, which are cheap to hash. The
+# full key, which adds the values, is only built once a program is due to
+# be compiled. Programs that differ only in names or literals share a count,
+# so such an edit to a program run that often is compiled on its first run.
+_COMPILE_AFTER_RUNS = 8
+_run_counts = {}
+
+# Python's compiler fails on very long operator chains, so expressions with
+# more operands than this stay interpreted
+_MAX_COMPILED_OPERANDS = 1000
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_program(key: bytes, values: tuple) -> Callable | None:
+    """Translates the statements _walk_program finds into a Python function
+    taking the output list's append method. Returns None when running the
+    program would raise, so evaluate can interpret it and fail the same way."""
+    packed = array('i')
+    packed.frombytes(key)
+    types = packed.tolist()
+    n = len(types)
+    slot_of = {}    # variable name -> local variable in the generated code
+    
+    def var(name):
+        slot = slot_of.get(name)
+        if slot is None:
+            slot = slot_of[name] = f"v{len(slot_of)}"
+        return slot
+    
+    lines = []
+    try:
+        statements = list(_walk_program(types, values))
+    except IndexError:
+        return None
+    for target, start, stop in statements:
+        if start is None:
+            expression = "0"
+        else:
+            operands = (stop - start + 1) // 2
+            if operands > _MAX_COMPILED_OPERANDS or stop > n:
+                return None
+            parts = []
+            for j in range(start, stop, 2):
+                if j > start:
+                    parts.append("+" if types[j-1] == T.PLUS else "-")
+                ttype = types[j]
+                if ttype == T.IDENTIFIER:
+                    parts.append(var(values[j]))
+                elif ttype == T.NUMBER:
+                    try:
+                        parts.append(repr(int(values[j])))
+                    except ValueError:
+                        return None     # int() refuses it when run, too
+                elif ttype == T.STRING_LITERAL:
+                    parts.append(repr(values[j]))
+                else:
+                    return None     # "Bad expression"
+            expression = " ".join(parts)
+        if target is None:
+            lines.append(f"out(str({expression}))")
+        else:
+            lines.append(f"{var(target)} = {expression}")
+    
+    # Undeclared variables read as 0, like symbols.get(name, 0)
+    if slot_of:
+        lines.insert(0, " = ".join(slot_of.values()) + " = 0")
+    source = "def program(out):\n    " + "\n    ".join(lines or ["pass"])
+    namespace = {}
+    try:
+        exec(compile(source, "<program>", "exec"), namespace)
+    except (RecursionError, MemoryError, SyntaxError):
+        return None     # the interpreter can still run it
+    return namespace["program"]
+
+
+def evaluate(types: array, values: list[str]) -> str:
+    """Simple interpreter: evaluates variable declarations, assignments,
+    and printf() calls with numeric or string expressions. Programs run
+    often enough are compiled to Python instead (see _compile_program)."""
+    
+    shape = types.tobytes()
+    runs = _run_counts.get(shape, 0)
+    if runs >= _COMPILE_AFTER_RUNS:
+        program = _compile_program(shape, tuple(values))
+        if program is not None:
+            output = []
+            program(output.append)
+            return "\n".join(output)
+    else:
+        if len(_run_counts) >= 32:
+            _run_counts.clear()
+        _run_counts[shape] = runs + 1
+    
+    return _interpret(types.tolist(), values)
+
+
+def _interpret(types: list, values: list[str]) -> str:
+    """Runs each statement as _walk_program finds it, one token at a time."""
+    symbols = {}    # variable storage
+    output = []     # printed output lines
+    # Token codes read per operand are bound to locals
+    IDENTIFIER, NUMBER, PLUS = T.IDENTIFIER, T.NUMBER, T.PLUS
+    
+    def get_value(j):
+        """Value of the NUMBER, STRING_LITERAL or IDENTIFIER token at j."""
+        ttype = types[j]
+        if ttype == IDENTIFIER:
+            return symbols.get(values[j], 0)
+        if ttype == NUMBER:
+            return int(values[j])
+        if ttype == T.STRING_LITERAL:
+            return values[j]    # the lexer already stripped the quotes
+        raise ValueError("Bad expression")
+    
+    for target, start, stop in _walk_program(types, values):
+        if start is None:
+            value = 0
+        else:
+            # Simple expression evaluator (handles + and - only)
+            value = get_value(start)
+            for j in range(start + 2, stop, 2):
+                if types[j-1] == PLUS:
+                    value = value + get_value(j)
+                else:
+                    value = value - get_value(j)
+        
+        if target is None:
+            output.append(str(value))
+        else:
+            symbols[target] = value
+    
+    return "\n".join(output)
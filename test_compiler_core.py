@@ -0,0 +1,145 @@
+import contextlib
+import io
+import random
+import unittest
+from unittest import mock
+
+import compiler_core
+from compiler_core import TOKEN_NAMES, _compile_program, _interpret, evaluate, lexical_analyzer
+
+
+def lex(code):
+    """Returns ([(type name, value), ...], has_error, console output)."""
+    console = io.StringIO()
+    with contextlib.redirect_stdout(console):
+        types, values, has_error = lexical_analyzer(code)
+    tokens = [(TOKEN_NAMES[t], v) for t, v in zip(types, values)]
+    return tokens, has_error, console.getvalue()
+
+
+class LexerEdgeCaseTests(unittest.TestCase):
+    """Pins the scanner's behaviour on inputs that take its non-ASCII and
+    error paths, matching what the original regex lexer produced."""
+
+    def assertLexes(self, code, tokens, has_error=False, errors=()):
+        got_tokens, got_error, console = lex(code)
+        self.assertEqual(got_tokens, tokens)
+        self.assertEqual(got_error, has_error)
+        self.assertEqual(console.splitlines(), list(errors))
+
+    def test_leading_zeros(self):
+        self.assertLexes("007", [("NUMBER", "007")])
+
+    def test_unicode_decimal_digits_are_a_number(self):
+        self.assertLexes("١٢", [("NUMBER", "١٢")])
+
+    def test_oversized_number_stays_a_token(self):
+        # Longer than int() accepts by default; only the evaluator converts
+        digits = "9" * 5000
+        self.assertLexes(digits, [("NUMBER", digits)])
+
+    def test_superscript_digit_is_unknown(self):
+        self.assertLexes("²", [], True, ["Lexical Error: Unknown character '²'"])
+
+    def test_non_ascii_letter_is_unknown(self):
+        self.assertLexes("é", [], True, ["Lexical Error: Unknown character 'é'"])
+
+    def test_word_with_non_ascii_letter_is_unknown(self):
+        self.assertLexes("aé", [], True, ["Lexical Error: Unknown characters 'aé'"])
+
+    def test_unicode_whitespace_separates_tokens(self):
+        self.assertLexes("a\u2003b", [("IDENTIFIER", "a"), ("IDENTIFIER", "b")])
+        self.assertLexes("a\xa0b", [("IDENTIFIER", "a"), ("IDENTIFIER", "b")])
+
+    def test_unterminated_string(self):
+        self.assertLexes('"abc', [("IDENTIFIER", "abc")], True,
+                         ["Lexical Error: Unknown character '\"'"])
+
+    def test_number_followed_by_letters_is_unknown(self):
+        self.assertLexes("5abc", [], True, ["Lexical Error: Unknown characters '5abc'"])
+
+    def test_string_literal(self):
+        self.assertLexes('x = "a b";', [("IDENTIFIER", "x"), ("EQUALS", "="),
+                                        ("STRING_LITERAL", "a b"), ("SEMICOLON", ";")])
+
+    def test_unknown_runs_are_reported_separately(self):
+        self.assertLexes("int x=1; é² @",
+                         [("INT_KEYWORD", "int"), ("IDENTIFIER", "x"), ("EQUALS", "="),
+                          ("NUMBER", "1"), ("SEMICOLON", ";")],
+                         True,
+                         ["Lexical Error: Unknown characters 'é²'",
+                          "Lexical Error: Unknown character '@'"])
+
+
+def outcome(run):
+    """What running a program produced: its output, or its error."""
+    try:
+        return "ok", run()
+    except Exception as e:
+        return type(e).__name__, str(e)
+
+
+class CompiledProgramTests(unittest.TestCase):
+    """The compiled form of a program must behave exactly like the
+    interpreter, including its quirks and its errors."""
+
+    def assertSameBehaviour(self, code):
+        """Returns whether the program could be compiled."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            types, values, _ = lexical_analyzer(code)
+        interpreted = outcome(lambda: _interpret(types.tolist(), values))
+        program = _compile_program(types.tobytes(), tuple(values))
+        if program is None:
+            return False
+
+        def run():
+            output = []
+            program(output.append)
+            return "\n".join(output)
+        self.assertEqual(outcome(run), interpreted, code)
+        return True
+
+    def test_known_programs(self):
+        for code in [
+            'int main() { int x = 10; int y = 3; y = x + 5 - y; printf(y); printf("hi" + "there"); printf(x, y); return; }',
+            "int main() { int x = 10; printf(x); }",  # x is left at 0
+            "int main() { printf(z + 1); }",          # undeclared reads as 0
+            'int main() { int a; a = "s" - 1; }',     # TypeError
+        ]:
+            self.assertTrue(self.assertSameBehaviour(code), code)
+
+    def test_programs_the_walk_rejects_stay_interpreted(self):
+        for code in ["int main() { printf(); }", "int main() { printf(1) }", "x"]:
+            self.assertFalse(self.assertSameBehaviour(code), code)
+
+    def test_random_token_sequences(self):
+        pieces = ["int", "x", "y", "printf", "=", "+", "-", ";", "(", ")", ",",
+                  "1", "22", '"s"', '"t"', "{", "}", "return", "main"]
+        rng = random.Random(0)
+        compiled = 0
+        for _ in range(2000):
+            code = " ".join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+            compiled += self.assertSameBehaviour(code)
+        self.assertGreater(compiled, 500)
+
+    def test_operand_cap(self):
+        cap = compiler_core._MAX_COMPILED_OPERANDS
+        for operands, compiles in [(cap, True), (cap + 1, False)]:
+            code = "int main() { int x; x = " + " + ".join(["1"] * operands) + "; printf(x); }"
+            self.assertEqual(self.assertSameBehaviour(code), compiles, operands)
+
+    def test_evaluate_switches_to_the_compiled_form(self):
+        code = "int main() { int x; x = 2; printf(x + 40); }"
+        threshold = compiler_core._COMPILE_AFTER_RUNS
+        compiler_core._run_counts.clear()
+        with mock.patch.object(compiler_core, "_interpret", wraps=_interpret) as interpret:
+            for run in range(1, threshold + 4):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    types, values, _ = lexical_analyzer(code)
+                self.assertEqual(evaluate(types, values), "42")
+                # Interpreted up to the threshold, compiled after it
+                self.assertEqual(interpret.call_count, min(run, threshold))
+
+
+if __name__ == "__main__":
+    unittest.main()